@@ -7,7 +7,8 @@ Small helper to build and export OTA-ready binaries.
 """
 
 import argparse
-import configparser
+import os
+import re
 import shutil
 import subprocess
 from pathlib import Path
@@ -19,14 +20,23 @@ DEFAULT_PREFIX = "XIAOS3Sense"
 
 def load_version(platformio_path: Path, env: str) -> str:
     """Read custom_fw_version from platformio.ini for the given env."""
-    config = configparser.ConfigParser()
-    config.optionxform = str  # Preserve case for keys
-    if not config.read(platformio_path):
-        raise FileNotFoundError(f"platformio.ini not found at {platformio_path}")
     try:
-        return config[f"env:{env}"]["custom_fw_version"].strip()
-    except KeyError as exc:  # pragma: no cover - simple guardrail
-        raise KeyError("custom_fw_version not set in platformio.ini") from exc
+        text = platformio_path.read_text(encoding="utf-8")
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"platformio.ini not found at {platformio_path}") from exc
+
+    # Only scan the [env:<name>] section: from its header up to the next section header.
+    section = re.search(
+        rf"^\[env:{re.escape(env)}\][^\n]*\n(.*?)(?=^\[|\Z)", text, re.MULTILINE | re.DOTALL
+    )
+    # Indented lines are continuations of the previous value in INI files, so
+    # only an unindented key counts; [ \t] keeps the match on a single line.
+    match = section and re.search(
+        r"^custom_fw_version[ \t]*[=:][ \t]*(.*?)[ \t]*$", section.group(1), re.MULTILINE
+    )
+    if not match or not match.group(1):
+        raise KeyError("custom_fw_version not set in platformio.ini")
+    return match.group(1)
 
 
 def run_cmd(cmd: list[str]) -> None:
@@ -34,29 +44,37 @@ def run_cmd(cmd: list[str]) -> None:
     subprocess.run(cmd, cwd=ROOT, check=True)
 
 
-def copy_artifact(src: Path, dest: Path) -> None:
-    """Copy a build artifact to the dist/ota folder, creating it if needed."""
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dest)
+def fast_copy(src: Path, dest: Path) -> None:
+    """Copy a build artifact into an existing folder, keeping its timestamps."""
+    # copyfile skips permission/xattr copying and lets the OS use a zero-copy
+    # path (sendfile/copy_file_range); only the timestamps are worth keeping.
+    shutil.copyfile(src, dest)
+    src_stat = os.stat(src)
+    os.utime(dest, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
 
 
 def build_and_export(env: str, prefix: str, version: str, skip_firmware: bool, skip_fs: bool) -> None:
     build_dir = ROOT / ".pio" / "build" / env
+    dist_dir = ROOT / "dist" / "ota"
+    dist_dir.mkdir(parents=True, exist_ok=True)
 
+    # Firmware and filesystem need separate `pio run` calls: when `buildfs` is on
+    # the command line the espressif32 builder points `buildprog` at the LittleFS
+    # image, so a combined run would never regenerate firmware.bin.
     if not skip_firmware:
         print(f"[firmware] Building env {env}...")
         run_cmd(["pio", "run", "-e", env])
         firmware_src = build_dir / "firmware.bin"
-        firmware_dest = ROOT / "dist" / "ota" / f"{prefix}-{version}-firmware.bin"
-        copy_artifact(firmware_src, firmware_dest)
+        firmware_dest = dist_dir / f"{prefix}-{version}-firmware.bin"
+        fast_copy(firmware_src, firmware_dest)
         print(f"[firmware] Exported to {firmware_dest}")
 
     if not skip_fs:
         print(f"[littlefs] Building filesystem for env {env}...")
         run_cmd(["pio", "run", "-t", "buildfs", "-e", env])
         littlefs_src = build_dir / "littlefs.bin"
-        littlefs_dest = ROOT / "dist" / "ota" / f"{prefix}-{version}-littlefs.bin"
-        copy_artifact(littlefs_src, littlefs_dest)
+        littlefs_dest = dist_dir / f"{prefix}-{version}-littlefs.bin"
+        fast_copy(littlefs_src, littlefs_dest)
         print(f"[littlefs] Exported to {littlefs_dest}")
 
 
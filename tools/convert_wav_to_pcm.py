@@ -7,6 +7,9 @@ Usage: python3 tools/convert_wav_to_pcm.py input.wav data/gong.pcm
 import sys
 import wave
 
+# Frames per read: 32K frames of mono 16-bit PCM is 64 KB, keeping memory flat.
+CHUNK_FRAMES = 1 << 15
+
 
 def main() -> int:
     if len(sys.argv) != 3:
@@ -25,12 +28,19 @@ def main() -> int:
             return 1
         if sample_rate != 16000:
             print(f"Warning: sample rate is {sample_rate} Hz (recommended: 16000 Hz).")
-        frames = wav_file.readframes(wav_file.getnframes())
-
-    with open(pcm_path, "wb") as pcm_file:
-        pcm_file.write(frames)
 
-    print(f"Wrote {pcm_path} ({len(frames)} bytes)")
+        # Stream the samples straight into the output file instead of
+        # loading the whole clip into memory.
+        total_bytes = 0
+        with open(pcm_path, "wb") as pcm_file:
+            while True:
+                frames = wav_file.readframes(CHUNK_FRAMES)
+                if not frames:
+                    break
+                pcm_file.write(frames)
+                total_bytes += len(frames)
+
+    print(f"Wrote {pcm_path} ({total_bytes} bytes)")
     return 0
 
 
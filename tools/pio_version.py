@@ -1,10 +1,14 @@
 import datetime
+import json
+import os
 import subprocess
 
 from SCons.Script import DefaultEnvironment
 
 env = DefaultEnvironment()
 project_dir = env["PROJECT_DIR"]
+git_dir = os.path.join(project_dir, ".git")
+cache_path = os.path.join(project_dir, ".pio", "version_cache.json")
 
 
 def run_git(args):
@@ -15,27 +19,108 @@ def run_git(args):
     ).decode("utf-8").strip()
 
 
-def read_version_base():
+def newest_mtime(root):
+    # Tags may live in nested folders (e.g. refs/tags/rel/v2.0); creating one
+    # only bumps its own folder's mtime, so walk the whole tree.
+    newest = None
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in [""] + filenames:
+            try:
+                mtime = os.stat(os.path.join(dirpath, name)).st_mtime_ns
+            except OSError:
+                continue
+            if newest is None or mtime > newest:
+                newest = mtime
+    return newest
+
+
+def git_state_key():
+    # PlatformIO runs this script on nearly every command, so git results are
+    # cached until HEAD, the index, packed-refs, the refs HEAD points at or any
+    # tag change.
+    paths = [
+        os.path.join(git_dir, "HEAD"),
+        os.path.join(git_dir, "index"),
+        os.path.join(git_dir, "packed-refs"),
+    ]
+    try:
+        with open(paths[0], "r", encoding="utf-8") as head_file:
+            head = head_file.read().strip()
+    except OSError:
+        return None
+    if head.startswith("ref: "):
+        paths.append(os.path.join(git_dir, head[5:]))
+
+    key = [head]
+    for path in paths:
+        try:
+            key.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            key.append(None)
+    key.append(newest_mtime(os.path.join(git_dir, "refs", "tags")))
+    return key
+
+
+def load_git_cache(key):
+    if key is None:
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+    except (OSError, ValueError):
+        return {}
+    # Anything that isn't the shape we write is treated as a cache miss.
+    if not isinstance(cache, dict) or cache.get("key") != key:
+        return {}
+    values = cache.get("values")
+    if not isinstance(values, dict):
+        return {}
+    return values
+
+
+def save_git_cache(key, values):
+    if key is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as cache_file:
+            json.dump({"key": key, "values": values}, cache_file)
+    except OSError:
+        pass
+
+
+def read_version_base(cached):
     custom_version = env.GetProjectOption("custom_fw_version")
     if custom_version:
         return custom_version.lstrip("v").strip()
 
+    if "tag" in cached:
+        return cached["tag"]
     try:
-        tag = run_git(["describe", "--tags", "--abbrev=0"])
-        return tag.lstrip("v")
+        cached["tag"] = run_git(["describe", "--tags", "--abbrev=0"]).lstrip("v")
     except Exception:
+        # Fallbacks are not cached so a later tag or repo fix is picked up.
         return "0.0.0"
+    return cached["tag"]
 
 
-def read_git_hash():
+def read_git_hash(cached):
+    if "hash" in cached:
+        return cached["hash"]
     try:
-        return run_git(["rev-parse", "--short", "HEAD"])
+        cached["hash"] = run_git(["rev-parse", "--short", "HEAD"])
     except Exception:
         return "nogit"
+    return cached["hash"]
 
 
-version_base = read_version_base()
-git_hash = read_git_hash()
+cache_key = git_state_key()
+git_values = load_git_cache(cache_key)
+cached_before = dict(git_values)
+version_base = read_version_base(git_values)
+git_hash = read_git_hash(git_values)
+if git_values != cached_before:
+    save_git_cache(cache_key, git_values)
 fw_version = f"{version_base}+{git_hash}"
 build_time = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
 